@@ -0,0 +1,116 @@
+import argparse
+import csv
+import json
+import os
+import random
+import string
+import tempfile
+import time
+
+from compression import CODECS, open_storage_file
+from storage_csv import StorageCsv
+from storage_json import StorageJson
+
+
+def generate_catalog(size):
+    """
+    Generate a synthetic movie catalog.
+
+    Titles are built from a large vocabulary of made-up words and poster URLs
+    carry random image ids like the OMDb ones, so the catalog compresses
+    about as well as a real one rather than as well as templated strings.
+
+    Args:
+        size (int): The number of movies in the catalog.
+
+    Returns:
+        dict: A dictionary containing the movies' information.
+    """
+    rng = random.Random(size)
+    syllables = [consonant + vowel for consonant in "bcdfghjklmnprstvwz" for vowel in "aeiouy"]
+    vocabulary = [''.join(rng.choices(syllables, k=rng.randint(1, 4))).capitalize()
+                  for _ in range(5000)]
+    id_chars = string.ascii_letters + string.digits
+
+    movies = {}
+    while len(movies) < size:
+        title = ' '.join(rng.choices(vocabulary, k=rng.randint(1, 4)))
+        image_id = ''.join(rng.choices(id_chars, k=rng.randint(32, 64)))
+        movies[title] = {
+            'year': str(rng.randint(1920, 2024)),
+            'rating': round(rng.uniform(1, 10), 1),
+            'poster_url': f"https://m.media-amazon.com/images/M/{image_id}@@._V1_SX300.jpg"
+        }
+    return movies
+
+
+def write_catalog(movies, file_path, storage_name):
+    """
+    Write a catalog to a JSON or CSV storage file, compressed or not.
+
+    Args:
+        movies (dict): The movies to write.
+        file_path (str): The path to the storage file.
+        storage_name (str): The file format, "json" or "csv".
+
+    Returns:
+        None
+    """
+    if storage_name == 'json':
+        with open_storage_file(file_path, 'w') as file:
+            json.dump(movies, file)
+        return
+
+    with open_storage_file(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['title', 'rating', 'year', 'poster_url'])
+        for title, movie in movies.items():
+            writer.writerow([title, movie['rating'], movie['year'], movie['poster_url']])
+
+
+def run(size, repeat):
+    """
+    Print the file size and load time of each codec for both storages.
+
+    Args:
+        size (int): The number of movies in the synthetic catalog.
+        repeat (int): The number of loads to take the best time of.
+
+    Returns:
+        None
+    """
+    movies = generate_catalog(size)
+    extensions = [('none', '')] + [(codec, spec[0]) for codec, spec in CODECS.items()]
+
+    print(f"Catalog of {size} movies, best of {repeat} loads")
+    print(f"{'storage':<8}{'codec':<8}{'size (KB)':>12}{'ratio':>8}{'load (s)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_name, storage_class in (('json', StorageJson), ('csv', StorageCsv)):
+            raw_size = None
+            for codec, extension in extensions:
+                file_path = os.path.join(directory, f"movies.{storage_name}{extension}")
+                write_catalog(movies, file_path, storage_name)
+                file_size = os.path.getsize(file_path)
+                if raw_size is None:
+                    raw_size = file_size
+
+                storage = storage_class(file_path)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    storage.list_movies()
+                    timings.append(time.perf_counter() - start)
+
+                print(f"{storage_name:<8}{codec:<8}{file_size / 1024:>12.1f}"
+                      f"{raw_size / file_size:>8.2f}{min(timings):>10.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare storage codecs on a synthetic catalog.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 500000],
+                        help="numbers of movies, one catalog per size")
+    parser.add_argument('--repeat', type=int, default=3, help="number of loads per codec")
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.repeat)
+        print()
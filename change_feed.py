@@ -0,0 +1,358 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Size of the blocks the log is read backwards in.
+BLOCK_SIZE = 4096
+
+
+class ChangeFeed:
+    def __init__(self, file_path):
+        """
+        Initialize the ChangeFeed with the file path of its log.
+
+        The feed is an append-only JSON lines log next to the storage file.
+        Registered consumers, their checkpoints and the compaction point are
+        kept in a separate JSON file with the suffix ".checkpoints".
+
+        Nothing is cached in the instance: every operation re-reads the files
+        under an exclusive lock on "<file_path>.lock". Writers that hold the
+        same lock around their catalog write with locked() keep the catalog
+        and the feed in the same order across instances and processes.
+
+        Args:
+            file_path (str): The path to the change log file.
+        """
+        self.file_path = file_path
+        self.checkpoints_path = file_path + '.checkpoints'
+        self.lock_path = file_path + '.lock'
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+
+    @property
+    def last_seq(self):
+        """The sequence number of the latest change, 0 if there is none."""
+        with self.locked():
+            return self._read_last_seq(self._load_state())
+
+    @property
+    def compacted_seq(self):
+        """The sequence number up to which changes have been dropped."""
+        with self.locked():
+            return self._load_state()['compacted_seq']
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold an exclusive lock on the feed for the duration of the block.
+
+        The lock is re-entrant within an instance and excludes other threads,
+        so a storage can hold it around its catalog write and the append that
+        follows.
+        """
+        with self._thread_lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def append(self, op, title, movie=None):
+        """
+        Append a change to the log and flush it to disk.
+
+        The storages call this after their own file has been written, so a
+        crash in between leaves a change in the catalog that never reaches
+        the feed. Consumers that must not miss such a change should re-read
+        the whole catalog after a crash of the writer.
+
+        A record torn by an earlier crash is truncated before appending.
+
+        Args:
+            op (str): The operation, one of "add", "delete" or "update".
+            title (str): The title of the changed movie.
+            movie (dict): The movie's information after the change, or None.
+
+        Returns:
+            int: The sequence number of the change.
+        """
+        with self.locked():
+            self._truncate_torn_record()
+            seq = self._read_last_seq(self._load_state()) + 1
+            change = {'seq': seq, 'op': op, 'title': title, 'movie': movie}
+            with open(self.file_path, 'a') as file:
+                file.write(json.dumps(change) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+        return seq
+
+    def changes_since(self, seq):
+        """
+        Return the changes made after a sequence number.
+
+        The log is read backwards from its end, so the cost depends on the
+        number of changes returned rather than on the size of the log.
+
+        Args:
+            seq (int): The last sequence number the caller has seen, 0 for all.
+
+        Returns:
+            list: The changes with a sequence number above seq, oldest first.
+                Example:
+                [
+                  {"seq": 4, "op": "add", "title": "Titanic",
+                   "movie": {"year": 1997, "rating": 7.9, "poster_url": "..."}},
+                  {"seq": 5, "op": "delete", "title": "Titanic", "movie": null},
+                ]
+
+        Raises:
+            ValueError: If the changes after seq were compacted away, in which
+                case the caller has to re-read the whole catalog.
+        """
+        with self.locked():
+            state = self._load_state()
+            if seq < state['compacted_seq']:
+                raise ValueError(f"Changes up to {state['compacted_seq']} were compacted, "
+                                 f"cannot resume from {seq}")
+            changes = []
+            for change in self._read_log_reversed():
+                if change['seq'] <= seq:
+                    break
+                changes.append(change)
+            changes.reverse()
+            return changes
+
+    def register_consumer(self, name, seq=None):
+        """
+        Register a consumer so the changes it has not seen are kept.
+
+        Args:
+            name (str): The name of the consumer.
+            seq (int): The consumer's starting checkpoint, defaults to the
+                latest sequence number.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If seq is negative or its changes were compacted away.
+        """
+        with self.locked():
+            state = self._load_state()
+            if seq is None:
+                seq = self._read_last_seq(state)
+            self._check_seq(state, seq)
+            state['consumers'][name] = seq
+            self._save_state(state)
+
+    def unregister_consumer(self, name):
+        """
+        Remove a consumer and compact the changes no one else needs.
+
+        Args:
+            name (str): The name of the consumer.
+
+        Returns:
+            None
+        """
+        with self.locked():
+            state = self._load_state()
+            state['consumers'].pop(name, None)
+            self._save_state(state)
+            self._compact(state)
+
+    def checkpoint(self, name, seq):
+        """
+        Record that a consumer has processed the changes up to seq.
+
+        Args:
+            name (str): The name of a registered consumer.
+            seq (int): The last sequence number the consumer has processed.
+
+        Returns:
+            None
+
+        Raises:
+            KeyError: If the consumer is not registered.
+            ValueError: If seq is negative or its changes were compacted away.
+        """
+        with self.locked():
+            state = self._load_state()
+            if name not in state['consumers']:
+                raise KeyError(f"Consumer not registered: {name}")
+            self._check_seq(state, seq)
+            state['consumers'][name] = min(seq, self._read_last_seq(state))
+            self._save_state(state)
+            self._compact(state)
+
+    def compact(self):
+        """
+        Drop the changes every registered consumer has already processed.
+
+        Nothing is dropped while no consumer is registered.
+
+        Returns:
+            None
+        """
+        with self.locked():
+            self._compact(self._load_state())
+
+    @staticmethod
+    def _check_seq(state, seq):
+        """
+        Reject a consumer position the feed can no longer serve.
+        """
+        if seq < 0:
+            raise ValueError(f"Sequence number must not be negative: {seq}")
+        if seq < state['compacted_seq']:
+            raise ValueError(f"Changes up to {state['compacted_seq']} were compacted, "
+                             f"cannot resume from {seq}")
+
+    def _compact(self, state):
+        """
+        Compact the log past the oldest checkpoint. The lock must be held.
+        """
+        if not state['consumers']:
+            return
+        oldest_seq = min(state['consumers'].values())
+        if oldest_seq <= state['compacted_seq']:
+            return
+
+        # Raise the compaction point before rewriting the log, so a crash in
+        # between leaves extra old changes rather than a silent gap.
+        state['compacted_seq'] = oldest_seq
+        self._save_state(state)
+
+        changes = [change for change in self._read_log() if change['seq'] > oldest_seq]
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            for change in changes:
+                file.write(json.dumps(change) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.file_path)
+
+    def _read_log(self):
+        """
+        Yield the changes in the log, oldest first.
+
+        A trailing line without a newline is a record torn by a crash and
+        is skipped.
+        """
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, 'r') as file:
+            for line in file:
+                if not line.endswith('\n'):
+                    return
+                if line.strip():
+                    yield json.loads(line)
+
+    def _read_log_reversed(self):
+        """
+        Yield the changes in the log, newest first, reading it backwards.
+
+        A trailing line without a newline is a record torn by a crash and
+        is skipped.
+        """
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, 'rb') as file:
+            position = self._complete_size(file)
+            buffer = b''
+            while position > 0:
+                step = min(BLOCK_SIZE, position)
+                position -= step
+                file.seek(position)
+                lines = (file.read(step) + buffer).split(b'\n')
+                # the first line may continue in the previous block
+                buffer = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield json.loads(line)
+            if buffer.strip():
+                yield json.loads(buffer)
+
+    def _read_last_seq(self, state):
+        """
+        Return the sequence number of the last record in the log.
+
+        An empty log falls back to the compaction point, so numbering
+        continues after a full compaction.
+        """
+        last_change = next(self._read_log_reversed(), None)
+        if last_change is None:
+            return state['compacted_seq']
+        return last_change['seq']
+
+    def _truncate_torn_record(self):
+        """
+        Cut a trailing record torn by a crash off the log. The lock must be held.
+        """
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, 'rb+') as file:
+            complete_size = self._complete_size(file)
+            if complete_size != file.seek(0, os.SEEK_END):
+                file.truncate(complete_size)
+
+    @staticmethod
+    def _complete_size(file):
+        """
+        Return the size of a binary log file up to its last newline.
+        """
+        position = file.seek(0, os.SEEK_END)
+        while position > 0:
+            step = min(BLOCK_SIZE, position)
+            position -= step
+            file.seek(position)
+            index = file.read(step).rfind(b'\n')
+            if index != -1:
+                return position + index + 1
+        return 0
+
+    def _load_state(self):
+        """
+        Read the compaction point and consumer checkpoints from disk.
+        """
+        if not os.path.exists(self.checkpoints_path):
+            return {'compacted_seq': 0, 'consumers': {}}
+        with open(self.checkpoints_path, 'r') as file:
+            return json.load(file)
+
+    def _save_state(self, state):
+        """
+        Atomically write the compaction point and consumer checkpoints.
+        """
+        temp_path = self.checkpoints_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.checkpoints_path)
@@ -0,0 +1,64 @@
+import bz2
+import gzip
+import lzma
+import os
+
+# Compressed file codecs, keyed by name. Each entry holds the file
+# extension, the magic bytes at the start of the file and the opener.
+CODECS = {
+    'gzip': ('.gz', b'\x1f\x8b', gzip.open),
+    'bz2': ('.bz2', b'BZh', bz2.open),
+    'lzma': ('.xz', b'\xfd7zXZ\x00', lzma.open),
+}
+
+
+def detect_codec(file_path):
+    """
+    Detect the compression codec of a storage file.
+
+    An existing file is identified by its magic bytes, so a compressed file
+    is read correctly whatever its name. A file that does not exist yet is
+    identified by its extension, e.g. "movies.json.gz".
+
+    Args:
+        file_path (str): The path to the storage file.
+
+    Returns:
+        str: The codec name from CODECS, or None for an uncompressed file.
+    """
+    if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+        with open(file_path, 'rb') as file:
+            header = file.read(6)
+        for codec, (_, magic, _) in CODECS.items():
+            if header.startswith(magic):
+                return codec
+        return None
+
+    for codec, (extension, _, _) in CODECS.items():
+        if file_path.endswith(extension):
+            return codec
+    return None
+
+
+def open_storage_file(file_path, mode='r', newline=None):
+    """
+    Open a storage file in text mode, compressed or not.
+
+    Compressed files are decompressed as a stream while they are read, so
+    the whole decompressed file is never held in memory next to the
+    compressed one.
+
+    Args:
+        file_path (str): The path to the storage file.
+        mode (str): 'r', 'w' or 'a'.
+        newline (str): Passed on to the text wrapper, e.g. '' for CSV files.
+
+    Returns:
+        file: A text file object.
+    """
+    codec = detect_codec(file_path)
+    if codec is None:
+        return open(file_path, mode, newline=newline)
+
+    opener = CODECS[codec][2]
+    return opener(file_path, mode + 't', newline=newline)
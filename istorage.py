@@ -48,3 +48,67 @@ class IStorage(ABC):
             None
         """
         pass
+
+    @abstractmethod
+    def changes_since(self, seq):
+        """
+        Retrieve the changes made to the storage after a sequence number.
+
+        Every add, delete and update is recorded in a change feed, see
+        ChangeFeed.append for what a crash of the writer means for consumers.
+
+        Args:
+            seq (int): The last sequence number the caller has seen, 0 for all.
+
+        Returns:
+            list: The change records, oldest first.
+
+        Raises:
+            ValueError: If the changes after seq were compacted away.
+        """
+        pass
+
+    @abstractmethod
+    def register_consumer(self, name, seq=None):
+        """
+        Register a consumer of the change feed.
+
+        Changes are kept until every registered consumer has checkpointed
+        past them.
+
+        Args:
+            name (str): The name of the consumer.
+            seq (int): The consumer's starting checkpoint, defaults to the
+                latest sequence number.
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def unregister_consumer(self, name):
+        """
+        Remove a consumer of the change feed.
+
+        Args:
+            name (str): The name of the consumer.
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def checkpoint(self, name, seq):
+        """
+        Record that a consumer has processed the changes up to seq.
+
+        Args:
+            name (str): The name of a registered consumer.
+            seq (int): The last sequence number the consumer has processed.
+
+        Returns:
+            None
+        """
+        pass
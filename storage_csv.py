@@ -1,5 +1,7 @@
 import csv
 from istorage import IStorage
+from compression import open_storage_file
+from change_feed import ChangeFeed
 import matplotlib.pyplot as plt
 import requests
 from fuzzywuzzy import fuzz
@@ -10,6 +12,7 @@ import random
 class StorageCsv(IStorage):
     def __init__(self, file_path):
         self.file_path = file_path
+        self.change_feed = ChangeFeed(file_path + '.changes')
 
     def list_movies(self):
         """
@@ -31,7 +34,7 @@ class StorageCsv(IStorage):
         }
         """
         movies = {}
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             reader = csv.DictReader(file)
             for row in reader:
                 title = row['title'].strip()
@@ -46,50 +49,79 @@ class StorageCsv(IStorage):
         return movies
 
     def add_movie(self, title, year, rating, poster):
-        with open(self.file_path, 'a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([title, rating, year, poster])
+        with self.change_feed.locked():
+            with open_storage_file(self.file_path, 'a', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow([title, rating, year, poster])
+            self.change_feed.append('add', title.strip(), self._feed_record(rating, year, poster))
 
         print(f"Added movie: {title}")
 
+    @staticmethod
+    def _feed_record(rating, year, poster_url):
+        # the movie as list_movies reads it back; notes are not stored in the CSV
+        return {
+            'rating': str(rating).strip(),
+            'year': str(year).strip(),
+            'poster_url': '' if poster_url is None else str(poster_url)
+        }
+
     def delete_movie(self, title):
-        movies = self.list_movies()
+        with self.change_feed.locked():
+            movies = self.list_movies()
+
+            if title in movies:
+                with open_storage_file(self.file_path, 'w', newline='') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(['title', 'rating', 'year', 'poster_url'])
+                    for movie_title, movie_data in movies.items():
+                        if movie_title != title:
+                            writer.writerow([
+                                movie_title,
+                                str(movie_data['rating']),
+                                str(movie_data['year']),
+                                movie_data.get('poster_url', '')
+                            ])
+                self.change_feed.append('delete', title)
+                print(f"Deleted movie: {title}")
+            else:
+                print(f"Movie not found: {title}")
 
-        if title in movies:
-            with open(self.file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['title', 'rating', 'year', 'poster_url'])
-                for movie_title, movie_data in movies.items():
-                    if movie_title != title:
+    def update_movie(self, title, notes):
+        with self.change_feed.locked():
+            movies = self.list_movies()
+
+            if title in movies:
+                movies[title]['notes'] = notes
+
+                with open_storage_file(self.file_path, 'w', newline='') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(['title', 'rating', 'year', 'poster_url'])
+                    for movie_title, movie_data in movies.items():
                         writer.writerow([
                             movie_title,
                             str(movie_data['rating']),
                             str(movie_data['year']),
                             movie_data.get('poster_url', '')
                         ])
-            print(f"Deleted movie: {title}")
-        else:
-            print(f"Movie not found: {title}")
+                movie = movies[title]
+                self.change_feed.append('update', title,
+                                        self._feed_record(movie['rating'], movie['year'], movie['poster_url']))
+                print(f"Updated movie: {title}")
+            else:
+                print(f"Movie not found: {title}")
 
-    def update_movie(self, title, notes):
-        movies = self.list_movies()
+    def changes_since(self, seq):
+        return self.change_feed.changes_since(seq)
 
-        if title in movies:
-            movies[title]['notes'] = notes
+    def register_consumer(self, name, seq=None):
+        self.change_feed.register_consumer(name, seq)
 
-            with open(self.file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['title', 'rating', 'year', 'poster_url'])
-                for movie_title, movie_data in movies.items():
-                    writer.writerow([
-                        movie_title,
-                        str(movie_data['rating']),
-                        str(movie_data['year']),
-                        movie_data.get('poster_url', '')
-                    ])
-            print(f"Updated movie: {title}")
-        else:
-            print(f"Movie not found: {title}")
+    def unregister_consumer(self, name):
+        self.change_feed.unregister_consumer(name)
+
+    def checkpoint(self, name, seq):
+        self.change_feed.checkpoint(name, seq)
 
     def statistics(self):
         movies = self.list_movies()
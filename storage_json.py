@@ -1,4 +1,6 @@
 from istorage import IStorage
+from compression import open_storage_file
+from change_feed import ChangeFeed
 import json
 import matplotlib.pyplot as plt
 import requests
@@ -16,6 +18,7 @@ class StorageJson(IStorage):
             file_path (str): The path to the JSON file.
         """
         self.file_path = file_path
+        self.change_feed = ChangeFeed(file_path + '.changes')
 
     def list_movies(self):
         """
@@ -36,7 +39,7 @@ class StorageJson(IStorage):
                   },
                 }
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
         return movies
 
@@ -53,17 +56,19 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
-            movies = json.load(file)
+        with self.change_feed.locked():
+            with open_storage_file(self.file_path, 'r') as file:
+                movies = json.load(file)
 
-        movies[title] = {
-            'year': year,
-            'rating': rating,
-            'poster_url': poster
-        }
+            movies[title] = {
+                'year': year,
+                'rating': rating,
+                'poster_url': poster
+            }
 
-        with open(self.file_path, 'w') as file:
-            json.dump(movies, file)
+            with open_storage_file(self.file_path, 'w') as file:
+                json.dump(movies, file)
+            self.change_feed.append('add', title, movies[title])
 
         print(f"Added movie: {title}")
 
@@ -77,16 +82,18 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
-            movies = json.load(file)
-
-        if title in movies:
-            del movies[title]
-            with open(self.file_path, 'w') as file:
-                json.dump(movies, file)
-            print(f"Deleted movie: {title}")
-        else:
-            print(f"Movie not found: {title}")
+        with self.change_feed.locked():
+            with open_storage_file(self.file_path, 'r') as file:
+                movies = json.load(file)
+
+            if title in movies:
+                del movies[title]
+                with open_storage_file(self.file_path, 'w') as file:
+                    json.dump(movies, file)
+                self.change_feed.append('delete', title)
+                print(f"Deleted movie: {title}")
+            else:
+                print(f"Movie not found: {title}")
 
     def update_movie(self, title, notes):
         """
@@ -99,16 +106,69 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
-            movies = json.load(file)
+        with self.change_feed.locked():
+            with open_storage_file(self.file_path, 'r') as file:
+                movies = json.load(file)
+
+            if title in movies:
+                movies[title]['notes'] = notes
+                with open_storage_file(self.file_path, 'w') as file:
+                    json.dump(movies, file)
+                self.change_feed.append('update', title, movies[title])
+                print(f"Updated movie: {title}")
+            else:
+                print(f"Movie not found: {title}")
 
-        if title in movies:
-            movies[title]['notes'] = notes
-            with open(self.file_path, 'w') as file:
-                json.dump(movies, file)
-            print(f"Updated movie: {title}")
-        else:
-            print(f"Movie not found: {title}")
+    def changes_since(self, seq):
+        """
+        Return the changes made to the database after a sequence number.
+
+        Args:
+            seq (int): The last sequence number the caller has seen, 0 for all.
+
+        Returns:
+            list: The change records, oldest first. See ChangeFeed.changes_since.
+        """
+        return self.change_feed.changes_since(seq)
+
+    def register_consumer(self, name, seq=None):
+        """
+        Register a consumer of the database's change feed.
+
+        Args:
+            name (str): The name of the consumer.
+            seq (int): The consumer's starting checkpoint, defaults to the
+                latest sequence number.
+
+        Returns:
+            None
+        """
+        self.change_feed.register_consumer(name, seq)
+
+    def unregister_consumer(self, name):
+        """
+        Remove a consumer of the database's change feed.
+
+        Args:
+            name (str): The name of the consumer.
+
+        Returns:
+            None
+        """
+        self.change_feed.unregister_consumer(name)
+
+    def checkpoint(self, name, seq):
+        """
+        Record that a consumer has processed the changes up to seq.
+
+        Args:
+            name (str): The name of a registered consumer.
+            seq (int): The last sequence number the consumer has processed.
+
+        Returns:
+            None
+        """
+        self.change_feed.checkpoint(name, seq)
 
     def statistics(self):
         """
@@ -117,7 +177,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
 
         ratings = [movie["rating"] for movie in movies.values()]
@@ -146,7 +206,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
         name, rating = random.choice(list(movies.items()))
         print(f"Random movie: {name}, {rating}")
@@ -161,7 +221,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
         matches = []
         for movie, rating in movies.items():
@@ -185,7 +245,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
         sorted_movies = sorted(movies.items(), key=lambda x: x[1]['rating'], reverse=True)
         for movie, data in sorted_movies:
@@ -198,7 +258,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
 
         # get ratings from movie database
@@ -223,7 +283,7 @@ class StorageJson(IStorage):
         Returns:
             None
         """
-        with open(self.file_path, 'r') as file:
+        with open_storage_file(self.file_path, 'r') as file:
             movies = json.load(file)
 
         # Generate movie grid HTML code
@@ -0,0 +1,240 @@
+import csv
+import json
+
+import pytest
+
+from change_feed import ChangeFeed
+from storage_csv import StorageCsv
+from storage_json import StorageJson
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "movies.json.changes")
+
+
+def add_movies(feed, count):
+    return [feed.append('add', f"Movie {i}", {'rating': i}) for i in range(count)]
+
+
+def test_append_assigns_increasing_seqs(log_path):
+    feed = ChangeFeed(log_path)
+    assert add_movies(feed, 3) == [1, 2, 3]
+    assert feed.append('delete', "Movie 0") == 4
+    assert feed.last_seq == 4
+
+
+def test_changes_since_returns_only_newer_changes(log_path):
+    feed = ChangeFeed(log_path)
+    add_movies(feed, 2)
+    feed.append('delete', "Movie 0")
+
+    assert [change['seq'] for change in feed.changes_since(0)] == [1, 2, 3]
+    assert feed.changes_since(2) == [{'seq': 3, 'op': 'delete', 'title': "Movie 0", 'movie': None}]
+    assert feed.changes_since(3) == []
+
+
+def test_no_compaction_without_consumers(log_path):
+    feed = ChangeFeed(log_path)
+    add_movies(feed, 3)
+    feed.compact()
+    assert feed.compacted_seq == 0
+    assert len(feed.changes_since(0)) == 3
+
+
+def test_compacts_past_oldest_checkpoint(log_path):
+    feed = ChangeFeed(log_path)
+    feed.register_consumer('website', 0)
+    feed.register_consumer('mirror', 0)
+    add_movies(feed, 5)
+
+    feed.checkpoint('website', 4)
+    assert feed.compacted_seq == 0
+
+    feed.checkpoint('mirror', 2)
+    assert feed.compacted_seq == 2
+    assert [change['seq'] for change in feed.changes_since(2)] == [3, 4, 5]
+
+    feed.unregister_consumer('mirror')
+    assert feed.compacted_seq == 4
+    assert [change['seq'] for change in feed.changes_since(4)] == [5]
+
+
+def test_changes_since_compacted_seq_raises(log_path):
+    feed = ChangeFeed(log_path)
+    feed.register_consumer('mirror', 0)
+    add_movies(feed, 3)
+    feed.checkpoint('mirror', 2)
+
+    with pytest.raises(ValueError):
+        feed.changes_since(1)
+    with pytest.raises(ValueError):
+        feed.register_consumer('website', 1)
+
+
+def test_checkpoint_below_compacted_seq_raises(log_path):
+    feed = ChangeFeed(log_path)
+    feed.register_consumer('mirror', 0)
+    feed.register_consumer('website', 0)
+    add_movies(feed, 3)
+    feed.checkpoint('mirror', 2)
+    feed.checkpoint('website', 2)
+
+    with pytest.raises(ValueError):
+        feed.checkpoint('mirror', 0)
+    assert feed.changes_since(2)[0]['seq'] == 3
+
+
+def test_negative_seq_raises(log_path):
+    feed = ChangeFeed(log_path)
+    with pytest.raises(ValueError):
+        feed.register_consumer('mirror', -1)
+    feed.register_consumer('mirror', 0)
+    with pytest.raises(ValueError):
+        feed.checkpoint('mirror', -1)
+
+
+def test_checkpoint_unknown_consumer_raises(log_path):
+    with pytest.raises(KeyError):
+        ChangeFeed(log_path).checkpoint('mirror', 0)
+
+
+def test_reopen_continues_numbering(log_path):
+    feed = ChangeFeed(log_path)
+    feed.register_consumer('mirror', 0)
+    add_movies(feed, 3)
+    feed.checkpoint('mirror', 3)
+
+    reopened = ChangeFeed(log_path)
+    assert reopened.changes_since(3) == []
+    assert reopened.compacted_seq == 3
+    assert reopened.append('delete', "Movie 0") == 4
+
+
+def test_instances_share_sequence_numbers(log_path):
+    writer, other_writer = ChangeFeed(log_path), ChangeFeed(log_path)
+    assert writer.append('add', "Titanic") == 1
+    assert other_writer.append('add', "Heat") == 2
+    assert writer.append('delete', "Titanic") == 3
+    assert [change['seq'] for change in writer.changes_since(0)] == [1, 2, 3]
+
+
+def test_consumer_instance_checkpoints_past_its_startup(log_path):
+    writer = ChangeFeed(log_path)
+    mirror = ChangeFeed(log_path)
+    mirror.register_consumer('mirror', 0)
+    add_movies(writer, 2)
+
+    assert [change['seq'] for change in mirror.changes_since(0)] == [1, 2]
+    mirror.checkpoint('mirror', 2)
+    assert mirror.changes_since(2) == []
+    assert writer.compacted_seq == 2
+
+
+def test_instances_keep_each_others_consumers(log_path):
+    feed, other_feed = ChangeFeed(log_path), ChangeFeed(log_path)
+    feed.register_consumer('mirror', 0)
+    other_feed.register_consumer('histogram', 0)
+    add_movies(feed, 3)
+
+    feed.checkpoint('mirror', 3)
+    assert feed.compacted_seq == 0
+    assert len(other_feed.changes_since(0)) == 3
+
+
+def test_compaction_by_other_instance_raises(log_path):
+    writer = ChangeFeed(log_path)
+    mirror = ChangeFeed(log_path)
+    mirror.register_consumer('mirror', 0)
+    add_movies(writer, 3)
+    mirror.checkpoint('mirror', 2)
+
+    with pytest.raises(ValueError):
+        writer.changes_since(0)
+
+
+def test_torn_record_is_ignored_and_truncated(log_path):
+    feed = ChangeFeed(log_path)
+    add_movies(feed, 1)
+    with open(log_path, 'a') as file:
+        file.write('{"seq": 2, "op": "ad')
+
+    assert feed.last_seq == 1
+    assert [change['seq'] for change in feed.changes_since(0)] == [1]
+    assert feed.append('add', "Heat") == 2
+    assert [change['title'] for change in feed.changes_since(0)] == ["Movie 0", "Heat"]
+
+
+def test_changes_since_reads_across_blocks(log_path):
+    feed = ChangeFeed(log_path)
+    for i in range(200):
+        feed.append('add', f"Movie {i}", {'poster_url': 'x' * 100})
+
+    assert [change['seq'] for change in feed.changes_since(195)] == [196, 197, 198, 199, 200]
+    assert [change['seq'] for change in feed.changes_since(0)] == list(range(1, 201))
+
+
+@pytest.fixture
+def json_storage(tmp_path):
+    file_path = tmp_path / "movies.json"
+    file_path.write_text(json.dumps({"Titanic": {'year': "1997", 'rating': 7.9, 'poster_url': "titanic.jpg"}}))
+    return StorageJson(str(file_path))
+
+
+@pytest.fixture
+def csv_storage(tmp_path):
+    file_path = tmp_path / "movies.csv"
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['title', 'rating', 'year', 'poster_url'])
+        writer.writerow(['Titanic', '7.9', '1997', 'titanic.jpg'])
+    return StorageCsv(str(file_path))
+
+
+def test_storage_json_emits_changes(json_storage):
+    json_storage.add_movie("Heat", "1995", 8.3, "heat.jpg")
+    json_storage.update_movie("Titanic", "Long")
+    json_storage.delete_movie("Heat")
+
+    assert json_storage.changes_since(0) == [
+        {'seq': 1, 'op': 'add', 'title': "Heat",
+         'movie': {'year': "1995", 'rating': 8.3, 'poster_url': "heat.jpg"}},
+        {'seq': 2, 'op': 'update', 'title': "Titanic",
+         'movie': {'year': "1997", 'rating': 7.9, 'poster_url': "titanic.jpg", 'notes': "Long"}},
+        {'seq': 3, 'op': 'delete', 'title': "Heat", 'movie': None},
+    ]
+
+
+def test_storage_csv_emits_changes_as_stored(csv_storage):
+    csv_storage.add_movie(" Heat ", " 1995", 8.3, "heat.jpg")
+    csv_storage.update_movie("Titanic", "Long")
+    csv_storage.delete_movie("Heat")
+
+    assert csv_storage.changes_since(0) == [
+        {'seq': 1, 'op': 'add', 'title': "Heat",
+         'movie': {'rating': "8.3", 'year': "1995", 'poster_url': "heat.jpg"}},
+        {'seq': 2, 'op': 'update', 'title': "Titanic",
+         'movie': {'rating': "7.9", 'year': "1997", 'poster_url': "titanic.jpg"}},
+        {'seq': 3, 'op': 'delete', 'title': "Heat", 'movie': None},
+    ]
+
+
+@pytest.mark.parametrize('storage_fixture', ['json_storage', 'csv_storage'])
+def test_storage_not_found_emits_nothing(request, storage_fixture):
+    storage = request.getfixturevalue(storage_fixture)
+    storage.update_movie("Alien", "Long")
+    storage.delete_movie("Alien")
+    assert storage.changes_since(0) == []
+
+
+@pytest.mark.parametrize('storage_fixture', ['json_storage', 'csv_storage'])
+def test_storage_consumer_checkpoints(request, storage_fixture):
+    storage = request.getfixturevalue(storage_fixture)
+    storage.register_consumer('website')
+    storage.add_movie("Heat", "1995", 8.3, "heat.jpg")
+    storage.add_movie("Alien", "1979", 8.5, "alien.jpg")
+
+    storage.checkpoint('website', 1)
+    assert [change['title'] for change in storage.changes_since(1)] == ["Alien"]
+    with pytest.raises(ValueError):
+        storage.changes_since(0)
@@ -0,0 +1,101 @@
+import csv
+import json
+
+import pytest
+
+from compression import CODECS, detect_codec, open_storage_file
+from storage_csv import StorageCsv
+from storage_json import StorageJson
+
+EXTENSIONS = [(None, '')] + [(codec, spec[0]) for codec, spec in CODECS.items()]
+
+
+@pytest.mark.parametrize('codec, extension', EXTENSIONS)
+def test_detect_codec_by_extension_for_new_file(tmp_path, codec, extension):
+    assert detect_codec(str(tmp_path / f"movies.json{extension}")) == codec
+
+
+@pytest.mark.parametrize('codec, extension', EXTENSIONS)
+def test_detect_codec_by_extension_for_empty_file(tmp_path, codec, extension):
+    file_path = tmp_path / f"movies.json{extension}"
+    file_path.write_bytes(b'')
+    assert detect_codec(str(file_path)) == codec
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_detect_codec_by_magic_bytes_ignores_extension(tmp_path, codec):
+    file_path = str(tmp_path / f"movies.json{CODECS[codec][0]}")
+    with open_storage_file(file_path, 'w') as file:
+        file.write('{}')
+
+    renamed_path = tmp_path / "movies.json"
+    (tmp_path / f"movies.json{CODECS[codec][0]}").rename(renamed_path)
+    assert detect_codec(str(renamed_path)) == codec
+
+
+def test_detect_codec_uncompressed_file_with_compressed_extension(tmp_path):
+    file_path = tmp_path / "movies.json.gz"
+    file_path.write_text('{}')
+    assert detect_codec(str(file_path)) is None
+
+
+@pytest.mark.parametrize('codec, extension', EXTENSIONS)
+def test_json_round_trip(tmp_path, codec, extension):
+    file_path = str(tmp_path / f"movies.json{extension}")
+    movies = {"Titanic": {"year": "1997", "rating": 7.9, "poster_url": ""}}
+    with open_storage_file(file_path, 'w') as file:
+        json.dump(movies, file)
+
+    assert detect_codec(file_path) == codec
+    with open_storage_file(file_path, 'r') as file:
+        assert json.load(file) == movies
+
+
+@pytest.mark.parametrize('codec, extension', EXTENSIONS)
+def test_csv_append_round_trip(tmp_path, codec, extension):
+    file_path = str(tmp_path / f"movies.csv{extension}")
+    with open_storage_file(file_path, 'w', newline='') as file:
+        csv.writer(file).writerow(['title', 'rating', 'year', 'poster_url'])
+    # every append adds a new gzip member / bz2 or xz stream
+    for title in ['Titanic', 'Heat', 'Alien']:
+        with open_storage_file(file_path, 'a', newline='') as file:
+            csv.writer(file).writerow([title, '7.0', '1997', ''])
+
+    assert detect_codec(file_path) == codec
+    with open_storage_file(file_path, 'r', newline='') as file:
+        titles = [row['title'] for row in csv.DictReader(file)]
+    assert titles == ['Titanic', 'Heat', 'Alien']
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_storage_json_compressed_round_trip(tmp_path, codec):
+    file_path = str(tmp_path / f"movies.json{CODECS[codec][0]}")
+    with open_storage_file(file_path, 'w') as file:
+        json.dump({}, file)
+    storage = StorageJson(file_path)
+
+    storage.add_movie("Titanic", "1997", 7.9, "titanic.jpg")
+    storage.add_movie("Heat", "1995", 8.3, "heat.jpg")
+    storage.delete_movie("Titanic")
+
+    assert detect_codec(file_path) == codec
+    assert storage.list_movies() == {"Heat": {'year': "1995", 'rating': 8.3, 'poster_url': "heat.jpg"}}
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_storage_csv_compressed_round_trip(tmp_path, codec):
+    file_path = str(tmp_path / f"movies.csv{CODECS[codec][0]}")
+    with open_storage_file(file_path, 'w', newline='') as file:
+        csv.writer(file).writerow(['title', 'rating', 'year', 'poster_url'])
+    storage = StorageCsv(file_path)
+
+    storage.add_movie("Titanic", "1997", 7.9, "titanic.jpg")
+    storage.add_movie("Heat", "1995", 8.3, "heat.jpg")
+    storage.delete_movie("Titanic")
+    storage.add_movie("Alien", "1979", 8.5, "alien.jpg")
+
+    assert detect_codec(file_path) == codec
+    assert storage.list_movies() == {
+        "Heat": {'rating': "8.3", 'year': "1995", 'poster_url': "heat.jpg"},
+        "Alien": {'rating': "8.5", 'year': "1979", 'poster_url': "alien.jpg"},
+    }